@@ -2,7 +2,7 @@ from typing import Union
 
 import lab as B
 import numpy as np
-from matrix import AbstractMatrix, Dense, Diagonal, LowRank, Woodbury
+from matrix import AbstractMatrix, Dense, Diagonal, LowRank, Woodbury, Zero
 from plum import parametric
 from stheno import Normal
 from wbml.util import indented_kv
@@ -12,7 +12,7 @@ from ..aggregate import Aggregate
 from ..util import batch, split
 from .dist import AbstractDistribution, shape_batch
 
-__all__ = ["MultiOutputNormal"]
+__all__ = ["MultiOutputNormal", "can_sample_jointly", "sample_jointly"]
 
 
 @_dispatch
@@ -189,7 +189,7 @@ class MultiOutputNormal(AbstractDistribution):
                     B.take(d_b.mean, mask, axis=-2),
                     B.submatrix(d_b.var, mask),
                 )
-                logpdfs.append(d_b.logpdf(x_b[mask, :]))
+                logpdfs.append(d_b.logpdf(B.take(x_b, mask, axis=0)))
             return B.stack(*logpdfs, axis=-1)
 
     @_dispatch
@@ -218,6 +218,61 @@ class MultiOutputNormal(AbstractDistribution):
         return self.vectorised_normal.entropy()
 
 
+def can_sample_jointly(*dists):
+    """Check whether distributions can be sampled with :func:`.sample_jointly`. This
+    is the case for at least two diagonal :class:`.MultiOutputNormal`s with
+    identically shaped parameters.
+
+    Args:
+        *dists (:class:`.AbstractDistribution`): Distributions.
+
+    Returns:
+        bool: `True` if the distributions can be sampled jointly.
+    """
+    if len(dists) < 2:
+        return False
+    for d in dists:
+        if not (
+            isinstance(d, MultiOutputNormal)
+            and isinstance(d._mean, Dense)
+            and isinstance(d._var, Zero)
+            and isinstance(d._noise, Diagonal)
+        ):
+            return False
+    shape_mean = B.shape(dists[0]._mean.mat)
+    shape_noise = B.shape(dists[0]._noise.diag)
+    return all(
+        B.shape(d._mean.mat) == shape_mean and B.shape(d._noise.diag) == shape_noise
+        for d in dists[1:]
+    )
+
+
+def sample_jointly(state: B.RandomState, *dists, shape=()):
+    """Sample multiple diagonal :class:`.MultiOutputNormal`s with a single draw of
+    noise. Use :func:`.can_sample_jointly` to check whether this is possible.
+
+    Args:
+        state (random state): Random state.
+        *dists (:class:`.MultiOutputNormal`): Distributions.
+        shape (tuple[int], optional): Batch shape of the sample.
+
+    Returns:
+        random state: Random state.
+        tuple[tensor]: Sample for every distribution.
+    """
+    # Stack the parameters of all distributions along a new first axis.
+    mean = B.stack(*(d._mean.mat[..., 0] for d in dists), axis=0)
+    std = B.sqrt(B.stack(*(d._noise.diag for d in dists), axis=0))
+    state, noise = B.randn(state, B.dtype(mean), *shape, *B.shape(mean))
+    sample = B.add(mean, B.multiply(std, noise))
+    # Split the sample back up and undo the vectorisation of every distribution.
+    index = (slice(None),) * len(shape)
+    return state, tuple(
+        _monormal_unvectorise(sample[index + (i,)], d.shape)
+        for i, d in enumerate(dists)
+    )
+
+
 @B.dispatch
 def dtype(dist: MultiOutputNormal):
     return B.dtype(dist._mean, dist._var, dist._noise)
@@ -28,6 +28,7 @@ def elbo(
     subsume_context=False,
     fix_noise=None,
     dtype_lik=None,
+    high_precision=False,
     **kw_args,
 ):
     """ELBO objective.
@@ -46,19 +47,25 @@ def elbo(
             Defaults to `False`.
         fix_noise (float, optional): Fix the likelihood variance to this value.
         dtype_lik (dtype, optional): Data type to use for the likelihood computation.
-            Defaults to the 64-bit variant of the data type of `yt`.
+            Defaults to the data type of `yt`, or its 64-bit variant if
+            `high_precision` is set.
+        high_precision (bool, optional): If `dtype_lik` is not given, perform the
+            likelihood computation in the 64-bit variant of the data type of `yt`.
+            Defaults to `False`. Note that :func:`.predict` defaults to `True`.
 
     Returns:
         random state, optional: Random state.
         tensor: ELBOs.
     """
     float = B.dtype_float(yt)
-    float64 = B.promote_dtypes(float, np.float64)
 
-    # For the likelihood computation, default to using a 64-bit version of the data
-    # type of `yt`.
+    # For the likelihood computation, default to the data type of `yt`. Only promote
+    # to 64 bits if high precision is explicitly asked for.
     if not dtype_lik:
-        dtype_lik = float64
+        if high_precision:
+            dtype_lik = B.promote_dtypes(float, np.float64)
+        else:
+            dtype_lik = float
 
     if subsume_context:
         # Only here also update the targets.
@@ -105,11 +112,13 @@ def elbo(
     d = fix_noise_in_pred(d, fix_noise)
 
     # Compute the ELBO.
-    elbos = B.mean(d.logpdf(B.cast(dtype_lik, yt)), axis=0) - _kl(qz, pz)
+    yt_lik = B.cast(dtype_lik, yt)
+    elbos = B.mean(d.logpdf(yt_lik), axis=0) - _kl(qz, pz)
 
     if normalise:
-        # Normalise by the number of targets.
-        elbos = elbos / B.cast(dtype_lik, num_data(xt, yt))
+        # Normalise by the number of targets. Counting with `yt_lik` directly gives
+        # the count in the right data type.
+        elbos = elbos / num_data(xt, yt_lik)
 
     return state, elbos
 
@@ -134,7 +143,12 @@ def _kl(q: AbstractDistribution, p: AbstractDistribution):
 
 @_dispatch
 def _kl(q: Parallel, p: Parallel):
-    return sum([_kl(qi, pi) for qi, pi in zip(q, p)])
+    # Accumulate the KLs one by one, so at most two of them are alive at any time.
+    kl = None
+    for qi, pi in zip(q, p):
+        kl_i = _kl(qi, pi)
+        kl = kl_i if kl is None else B.add(kl, kl_i)
+    return kl
 
 
 @_dispatch
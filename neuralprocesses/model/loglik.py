@@ -1,12 +1,17 @@
+import math
+
 import lab as B
 import numpy as np
 
 from .. import _dispatch
+from ..coders.setconv.density import PrependDensityChannel
+from ..mask import Masked
 from ..numdata import num_data
+from ..util import split
 from .model import Model
 from .util import fix_noise as fix_noise_in_pred
 
-__all__ = ["loglik"]
+__all__ = ["loglik", "loglik_batched"]
 
 
 @_dispatch
@@ -22,6 +27,7 @@ def loglik(
     normalise=False,
     fix_noise=None,
     dtype_lik=None,
+    high_precision=False,
     **kw_args,
 ):
     """Log-likelihood objective.
@@ -39,19 +45,28 @@ def loglik(
             Defaults to `False`.
         fix_noise (float, optional): Fix the likelihood variance to this value.
         dtype_lik (dtype, optional): Data type to use for the likelihood computation.
-            Defaults to the 64-bit variant of the data type of `yt`.
+            Defaults to the data type of `yt`, or its 64-bit variant if
+            `high_precision` is set.
+        high_precision (bool, optional): If `dtype_lik` is not given, perform the
+            likelihood computation in the 64-bit variant of the data type of `yt`.
+            Defaults to `False`. Note that :func:`.predict` defaults to `True`.
 
     Returns:
         random state, optional: Random state.
         tensor: Log-likelihoods.
     """
     float = B.dtype_float(yt)
-    float64 = B.promote_dtypes(float, np.float64)
 
-    # For the likelihood computation, default to using a 64-bit version of the data
-    # type of `yt`.
+    # For the likelihood computation, default to the data type of `yt`. Only promote
+    # to 64 bits if high precision is explicitly asked for.
     if not dtype_lik:
-        dtype_lik = float64
+        if high_precision:
+            dtype_lik = B.promote_dtypes(float, np.float64)
+        else:
+            dtype_lik = float
+
+    # Convert the targets to the right data type once rather than for every batch.
+    yt_lik = B.cast(dtype_lik, yt)
 
     # Sample in batches to alleviate memory requirements.
     logpdfs = None
@@ -60,44 +75,54 @@ def loglik(
         # Limit the number of samples at the batch size.
         this_num_samples = min(num_samples - done_num_samples, batch_size)
 
-        # Perform batch.
+        # Perform batch. With a single sample, don't introduce a sample dimension at
+        # all.
         state, pred = model(
             state,
             contexts,
             xt,
-            num_samples=this_num_samples,
+            num_samples=None if num_samples == 1 else this_num_samples,
             dtype_enc_sample=float,
             dtype_lik=dtype_lik,
             **kw_args,
         )
         pred = fix_noise_in_pred(pred, fix_noise)
-        this_logpdfs = pred.logpdf(B.cast(dtype_lik, yt))
+        this_logpdfs = pred.logpdf(yt_lik)
 
-        # If the number of samples is equal to one but `num_samples > 1`, then the
-        # encoding was a `Dirac`, so we can stop batching. Also, set `num_samples = 1`
-        # because we only have one sample now. We also don't need to do the
-        # `logsumexp` anymore.
-        if num_samples > 1 and B.shape(this_logpdfs, 0) == 1:
+        # Without a sample dimension, there is nothing to average over.
+        if num_samples == 1:
             logpdfs = this_logpdfs
+            break
+
+        # If the number of samples is equal to one but `this_num_samples > 1`, then
+        # the encoding was a `Dirac`, so we can stop batching. Also, set
+        # `num_samples = 1` because we only have one sample now.
+        if this_num_samples > 1 and B.shape(this_logpdfs, 0) == 1:
+            logpdfs = B.squeeze(this_logpdfs, axis=0)
             num_samples = 1
             break
 
-        # Record current samples.
+        # Sum over the samples of this batch and fold the result into the running
+        # `logsumexp`, so only one batch of log-pdfs is ever kept in memory. Sample
+        # dimension should always be the first.
+        this_logpdfs = B.logsumexp(this_logpdfs, axis=0)
         if logpdfs is None:
             logpdfs = this_logpdfs
         else:
-            # Concatenate at the sample dimension.
-            logpdfs = B.concat(logpdfs, this_logpdfs, axis=0)
+            logpdfs = B.logsumexp(B.stack(logpdfs, this_logpdfs, axis=0), axis=0)
 
         # Increase the counter.
         done_num_samples += this_num_samples
 
-    # Average over samples. Sample dimension should always be the first.
-    logpdfs = B.logsumexp(logpdfs, axis=0) - B.cast(dtype_lik, B.log(num_samples))
+    # Average over samples. Subtracting a Python scalar keeps the data type and
+    # avoids creating a constant tensor on every call.
+    if num_samples > 1:
+        logpdfs = logpdfs - math.log(num_samples)
 
     if normalise:
-        # Normalise by the number of targets.
-        logpdfs = logpdfs / B.cast(dtype_lik, num_data(xt, yt))
+        # Normalise by the number of targets. Counting with `yt_lik` directly gives
+        # the count in the right data type.
+        logpdfs = logpdfs / num_data(xt, yt_lik)
 
     return state, logpdfs
 
@@ -113,3 +138,120 @@ def loglik(model: Model, *args, **kw_args):
     state, logpdfs = loglik(state, model, *args, **kw_args)
     B.set_global_random_state(state)
     return logpdfs
+
+
+@_dispatch
+def loglik_batched(state: B.RandomState, model: Model, tasks: list, **kw_args):
+    """Log-likelihood objective for multiple tasks at once. The tasks are merged
+    along the batch dimension, so the model only runs once.
+
+    The model sees all tasks together. For models which discretise the inputs, like
+    the ConvCNP, the discretisation is therefore shared by all tasks, so the results
+    can differ slightly from running :func:`.loglik` for every task separately.
+
+    Only tasks consisting of plain tensors are supported. In particular, gridded
+    inputs and :class:`.Aggregate` outputs are not.
+
+    Args:
+        state (random state, optional): Random state.
+        model (:class:`.Model`): Model.
+        tasks (list[tuple]): Tasks of the form `(xc, yc, xt, yt)`. Context sets of
+            different sizes are padded by repeating the last context point and masked,
+            which requires an encoder that supports :class:`.Masked`, like that of the
+            ConvCNP. Target sets of different sizes are padded by repeating the last
+            target input with missing outputs, which requires a likelihood that
+            supports missing data. Note that the likelihood then loops over the batch
+            in Python, so padded targets are much slower than target sets of equal
+            sizes. Sets to pad cannot be empty.
+
+    Returns:
+        random state, optional: Random state.
+        list[tensor]: Log-likelihoods for every task.
+    """
+    for task in tasks:
+        for x, name in zip(task, ["xc", "yc", "xt", "yt"]):
+            _check_plain_tensor(x, name)
+    xcs, ycs, xts, yts = zip(*tasks)
+
+    if _all_same_shape(xcs) and _all_same_shape(ycs):
+        xc, yc = B.concat(*xcs, axis=0), B.concat(*ycs, axis=0)
+    else:
+        if not _contains_coder(model.encoder, PrependDensityChannel):
+            raise ValueError(
+                "Context sets of different sizes must be masked, but the encoder of "
+                "the model does not support masked context sets."
+            )
+        n = max(B.shape(xci, -1) for xci in xcs)
+        # Pad the inputs by repeating the last input, which keeps the padded inputs
+        # within the range of the actual inputs. Mask the padded outputs.
+        xc = B.concat(*(_pad_repeat_last(xci, n) for xci in xcs), axis=0)
+        yc = Masked(
+            B.concat(*(_pad_value(yci, n, 0) for yci in ycs), axis=0),
+            B.concat(*(_pad_value(_ones_mask(yci), n, 0) for yci in ycs), axis=0),
+        )
+
+    if _all_same_shape(xts) and _all_same_shape(yts):
+        xt, yt = B.concat(*xts, axis=0), B.concat(*yts, axis=0)
+    else:
+        n = max(B.shape(xti, -1) for xti in xts)
+        # Pad the inputs by repeating the last input, which keeps the padded inputs
+        # within the range of the actual inputs.
+        xt = B.concat(*(_pad_repeat_last(xti, n) for xti in xts), axis=0)
+        yt = B.concat(*(_pad_value(yti, n, B.nan) for yti in yts), axis=0)
+
+    state, logpdfs = loglik(state, model, xc, yc, xt, yt, **kw_args)
+
+    # Split the log-likelihoods back up into the individual tasks.
+    return state, split(logpdfs, [B.shape(yti, 0) for yti in yts], 0)
+
+
+@_dispatch
+def loglik_batched(model: Model, tasks: list, **kw_args):
+    state = B.global_random_state(B.dtype(tasks[0][-2]))
+    state, logpdfs = loglik_batched(state, model, tasks, **kw_args)
+    B.set_global_random_state(state)
+    return logpdfs
+
+
+@_dispatch
+def _check_plain_tensor(x: B.Numeric, name: str):
+    pass
+
+
+@_dispatch
+def _check_plain_tensor(x, name: str):
+    raise TypeError(
+        f"`loglik_batched` only supports plain tensors, "
+        f"but `{name}` is of type `{type(x).__name__}`."
+    )
+
+
+def _contains_coder(coder, coder_type):
+    if hasattr(coder, "modules"):
+        # PyTorch module
+        submodules = coder.modules()
+    else:
+        # TensorFlow module
+        submodules = [coder] + list(getattr(coder, "submodules", ()))
+    return any(isinstance(m, coder_type) for m in submodules)
+
+
+def _all_same_shape(xs):
+    return all(B.shape(x) == B.shape(xs[0]) for x in xs[1:])
+
+
+def _ones_mask(y):
+    with B.on_device(y):
+        return B.ones(B.dtype(y), B.shape(y, 0), 1, B.shape(y, -1))
+
+
+def _pad_repeat_last(x, n):
+    if B.shape(x, -1) == 0:
+        raise ValueError("Cannot pad an empty set by repeating its last element.")
+    return B.concat(x, *((x[..., -1:],) * (n - B.shape(x, -1))), axis=-1)
+
+
+def _pad_value(x, n, value):
+    shape = B.shape(x)[:-1] + (n - B.shape(x, -1),)
+    with B.on_device(x):
+        return B.concat(x, value + B.zeros(B.dtype(x), *shape), axis=-1)
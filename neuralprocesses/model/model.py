@@ -64,12 +64,7 @@ class Model:
         if aux_t is not None:
             xt = AugmentedInput(xt, aux_t)
 
-        # If the keyword `noiseless` is set to `True`, then that only applies to the
-        # decoder.
-        enc_kw_args = dict(kw_args)
-        if "noiseless" in enc_kw_args:
-            del enc_kw_args["noiseless"]
-        xz, pz = code(self.encoder, xc, yc, xt, root=True, **enc_kw_args)
+        xz, pz = self.encode(xc, yc, xt, **kw_args)
 
         # Sample and convert sample to the right data type.
         shape = () if num_samples is None else (num_samples,)
@@ -77,7 +72,7 @@ class Model:
         if dtype_enc_sample:
             z = B.cast(dtype_enc_sample, z)
 
-        _, d = code(self.decoder, xz, z, xt, root=True, **kw_args)
+        d = self.decode(xz, z, xt, **kw_args)
 
         return state, d
 
@@ -119,6 +114,41 @@ class Model:
         B.set_global_random_state(state)
         return d
 
+    def encode(self, xc, yc, xt, **kw_args):
+        """Run the encoder. The result can be reused for multiple calls of
+        :meth:`.Model.decode`.
+
+        Args:
+            xc (input): Context inputs.
+            yc (tensor): Context outputs.
+            xt (input): Target inputs, already augmented with any auxiliary target
+                information.
+
+        Returns:
+            input: Inputs of the encoding.
+            object: Distribution over the encoding.
+        """
+        # If the keyword `noiseless` is set to `True`, then that only applies to the
+        # decoder. Only copy the keyword arguments if it must be removed.
+        if "noiseless" in kw_args:
+            kw_args = {k: v for k, v in kw_args.items() if k != "noiseless"}
+        return code(self.encoder, xc, yc, xt, root=True, **kw_args)
+
+    def decode(self, xz, z, xt, **kw_args):
+        """Run the decoder on a sample of the encoding.
+
+        Args:
+            xz (input): Inputs of the encoding.
+            z (tensor): Sample of the encoding.
+            xt (input): Target inputs, already augmented with any auxiliary target
+                information.
+
+        Returns:
+            object: Prediction for target outputs.
+        """
+        _, d = code(self.decoder, xz, z, xt, root=True, **kw_args)
+        return d
+
     def __str__(self):
         return (
             f"Model(\n"
@@ -5,6 +5,7 @@ from .. import _dispatch
 from ..aggregate import Aggregate
 from ..dist import shape_batch
 from .model import Model
+from .util import compress_contexts, sample
 
 __all__ = ["predict"]
 
@@ -19,6 +20,7 @@ def predict(
     num_samples=50,
     batch_size=16,
     dtype_lik=None,
+    high_precision=True,
 ):
     """Use a model to predict.
 
@@ -31,7 +33,13 @@ def predict(
         num_samples (int, optional): Number of samples to produce. Defaults to 50.
         batch_size (int, optional): Batch size. Defaults to 16.
         dtype_lik (dtype, optional): Data type to use for the likelihood computation.
-            Defaults to the 64-bit variant of the data type of `xt`.
+            Defaults to the 64-bit variant of the data type of `xt`, or the data type
+            of `xt` itself if `high_precision` is turned off.
+        high_precision (bool, optional): If `dtype_lik` is not given, perform the
+            likelihood computation in the 64-bit variant of the data type of `xt`.
+            Unlike for :func:`.loglik` and :func:`.elbo`, this defaults to `True`,
+            because the marginal variance is computed as the difference of two
+            moments, which is prone to cancellation in lower precision.
 
     Returns:
         random state, optional: Random state.
@@ -43,27 +51,30 @@ def predict(
     float = B.dtype_float(xt)
 
     # For the likelihood computation, default to using a 64-bit version of the data
-    # type of `xt`.
+    # type of `xt`, unless high precision is turned off.
     if not dtype_lik:
-        dtype_lik = B.promote_dtypes(float, np.float64)
+        if high_precision:
+            dtype_lik = B.promote_dtypes(float, np.float64)
+        else:
+            dtype_lik = float
 
-    # Collect noiseless samples, noisy samples, first moments, and second moments.
+    # The encoding does not depend on the sample, so compute it only once and reuse
+    # it for every batch of samples.
+    xz, pz = model.encode(*compress_contexts(contexts), xt, dtype_lik=dtype_lik)
+
+    # Collect noiseless samples and noisy samples. Sum the first and second moments
+    # batch by batch, so they never need to be stored for all samples at once.
     ft, yt = [], []
-    m1s, m2s = [], []
+    m1, m2 = None, None
 
     done_num_samples = 0
     while done_num_samples < num_samples:
         # Limit the number of samples at the batch size.
         this_num_samples = min(num_samples - done_num_samples, batch_size)
 
-        state, pred = model(
-            state,
-            contexts,
-            xt,
-            dtype_enc_sample=float,
-            dtype_lik=dtype_lik,
-            num_samples=this_num_samples,
-        )
+        state, z = sample(state, pz, this_num_samples)
+        z = B.cast(float, z)
+        pred = model.decode(xz, z, xt, dtype_lik=dtype_lik)
 
         # If the number of samples is equal to one but `num_samples > 1`, then the
         # encoding was a `Dirac`, so we can stop batching. In this case, we can
@@ -86,14 +97,19 @@ def predict(
             )
 
         # Produce samples.
-        state, sample = pred.noiseless.sample(state)
-        ft.append(sample)
-        state, sample = pred.sample(state)
-        yt.append(sample)
-
-        # Produce moments.
-        m1s.append(pred.mean)
-        m2s.append(B.add(pred.var, B.multiply(m1s[-1], m1s[-1])))
+        state, ft_sample = pred.noiseless.sample(state)
+        ft.append(ft_sample)
+        state, yt_sample = pred.sample(state)
+        yt.append(yt_sample)
+
+        # Accumulate moments.
+        pred_mean = pred.mean
+        this_m1 = B.sum(pred_mean, axis=0)
+        this_m2 = B.sum(B.add(pred.var, B.multiply(pred_mean, pred_mean)), axis=0)
+        if m1 is None:
+            m1, m2 = this_m1, this_m2
+        else:
+            m1, m2 = B.add(m1, this_m1), B.add(m2, this_m2)
 
         done_num_samples += this_num_samples
 
@@ -102,8 +118,8 @@ def predict(
     yt = B.concat(*yt, axis=0)
 
     # Compute marginal statistics.
-    m1 = B.mean(B.concat(*m1s, axis=0), axis=0)
-    m2 = B.mean(B.concat(*m2s, axis=0), axis=0)
+    m1 = _divide(m1, num_samples)
+    m2 = _divide(m2, num_samples)
     mean, var = m1, B.subtract(m2, B.multiply(m1, m1))
 
     return state, mean, var, ft, yt
@@ -134,3 +150,13 @@ def _possibly_tile(x: B.Numeric, n: B.Int):
 @_dispatch
 def _possibly_tile(x: Aggregate, n: B.Int):
     return Aggregate(*(_possibly_tile(xi, n) for xi in x))
+
+
+@_dispatch
+def _divide(x: B.Numeric, n: B.Int):
+    return B.divide(x, n)
+
+
+@_dispatch
+def _divide(x: Aggregate, n: B.Int):
+    return Aggregate(*(_divide(xi, n) for xi in x))
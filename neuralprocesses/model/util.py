@@ -8,6 +8,8 @@ from ..dist import (
     MultiOutputNormal,
     SpikesSlab,
     TransformedMultiOutputDistribution,
+    can_sample_jointly,
+    sample_jointly,
 )
 from ..parallel import Parallel
 
@@ -36,6 +38,9 @@ def sample(
 
 @_dispatch
 def sample(state: B.RandomState, x: Parallel, *shape: B.Int):
+    if can_sample_jointly(*x):
+        state, samples = sample_jointly(state, *x, shape=shape)
+        return state, Parallel(*samples)
     samples = []
     for xi in x:
         state, s = sample(state, xi, *shape)
@@ -98,10 +103,9 @@ def compress_contexts(contexts: list):
     if len(contexts) == 1:
         return contexts[0]
     else:
-        return (
-            Parallel(*(c[0] for c in contexts)),
-            Parallel(*(c[1] for c in contexts)),
-        )
+        # Split the inputs and outputs in a single pass over the context sets.
+        xcs, ycs = zip(*contexts)
+        return Parallel(*xcs), Parallel(*ycs)
 
 
 @_dispatch
@@ -10,9 +10,9 @@ import neuralprocesses as nps
 import torch
 
 from .. import _dispatch
-from ..util import is_framework_module
+from ..util import is_framework_module, modules
 
-__all__ = ["num_params", "Module"]
+__all__ = ["num_params", "compile_model", "Module"]
 
 
 @is_framework_module.dispatch
@@ -34,6 +34,36 @@ def num_params(model: torch.nn.Module):
     return sum([int(np.prod(p.shape)) for p in model.parameters()])
 
 
+@_dispatch
+def compile_model(model: torch.nn.Module, **kw_args):
+    """Just-in-time compile a model with `torch.compile`.
+
+    Coders dispatch with `plum`, which makes them unsuitable for compilation. Instead,
+    only the PyTorch networks that the coders run, like MLPs and CNNs, are compiled.
+    These take in tensors and return tensors. The model is modified in place.
+
+    Args:
+        model (:class:`.Model`): Model.
+        **kw_args: Keyword arguments for `torch.compile`. `dynamic` defaults to `True`
+            to avoid recompiling for every new number of context or target points.
+
+    Returns:
+        :class:`.Model`: `model`.
+    """
+    kw_args.setdefault("dynamic", True)
+    _compile_networks(model, tuple(modules), kw_args)
+    return model
+
+
+def _compile_networks(module, module_types, kw_args):
+    for child in module.children():
+        if any(isinstance(m, module_types) for m in child.modules()):
+            # The child is or contains a coder. Descend into it.
+            _compile_networks(child, module_types, kw_args)
+        else:
+            child.compile(**kw_args)
+
+
 def ConvNd(
     dim: int,
     in_channels: int,
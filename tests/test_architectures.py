@@ -292,7 +292,8 @@ def test_elbo(nps, model_sample, normalise):
     elbos = nps.elbo(model, xc, yc, xt, yt, num_samples=2, normalise=normalise)
     assert B.rank(elbos) == 1
     assert np.isfinite(B.to_numpy(B.sum(elbos)))
-    assert B.dtype(elbos) == nps.dtype64
+    # By default, the likelihood is computed in the data type of the data.
+    assert B.dtype(elbos) == nps.dtype
 
 
 @pytest.mark.parametrize("aggregate", [False, True])
@@ -307,7 +308,8 @@ def test_loglik(nps, model_sample, normalise, aggregate):
     logpdfs = nps.loglik(model, xc, yc, xt, yt, num_samples=2, normalise=normalise)
     assert B.rank(logpdfs) == 1
     assert np.isfinite(B.to_numpy(B.sum(logpdfs)))
-    assert B.dtype(logpdfs) == nps.dtype64
+    # By default, the likelihood is computed in the data type of the data.
+    assert B.dtype(logpdfs) == nps.dtype
 
 
 @pytest.mark.parametrize("aggregate", [False, True])
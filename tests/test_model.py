@@ -2,6 +2,10 @@ import lab as B
 import numpy as np
 import pytest
 
+from neuralprocesses.dist import MultiOutputNormal, can_sample_jointly
+from neuralprocesses.model.util import sample
+from neuralprocesses.parallel import Parallel
+
 from .test_architectures import generate_data
 from .util import approx, generate_data, nps  # noqa
 
@@ -43,6 +47,48 @@ def test_loglik_dtype_lik(nps, dim_lv, dtype_lik, objective, normalise):
     assert np.isfinite(B.to_numpy(logpdfs))
 
 
+@pytest.mark.parametrize("high_precision", [False, True])
+@pytest.mark.parametrize("objective", ["loglik", "elbo"])
+def test_loglik_high_precision(nps, high_precision, objective):
+    xc, yc, xt, yt = generate_data(nps)
+    model = nps.construct_gnp(dim_lv=4, dtype=nps.dtype)
+
+    logpdfs = getattr(nps, objective)(
+        model,
+        xc,
+        yc,
+        xt,
+        yt,
+        high_precision=high_precision,
+    )
+    if high_precision:
+        assert B.dtype(logpdfs) == nps.dtype64
+    else:
+        assert B.dtype(logpdfs) == nps.dtype
+    assert np.all(np.isfinite(B.to_numpy(logpdfs)))
+
+
+@pytest.mark.parametrize("high_precision", [False, True])
+def test_predict_high_precision(nps, high_precision):
+    xc, yc, xt, yt = generate_data(nps)
+    model = nps.construct_gnp(dim_lv=4, dtype=nps.dtype)
+
+    mean, var, ft, yt = nps.predict(
+        model,
+        xc,
+        yc,
+        xt,
+        num_samples=3,
+        high_precision=high_precision,
+    )
+    if high_precision:
+        assert B.dtype(mean) == nps.dtype64
+        assert B.dtype(var) == nps.dtype64
+    else:
+        assert B.dtype(mean) == nps.dtype
+        assert B.dtype(var) == nps.dtype
+
+
 def test_ar_predict_without_aggregate(nps):
     xc, yc, xt, yt = generate_data(nps, dim_x=2, dim_y=3)
     convcnp = nps.construct_gnp(dim_x=2, dim_yc=(1, 1, 1), dim_yt=3, dtype=nps.dtype)
@@ -73,3 +119,113 @@ def test_ar_predict_without_aggregate(nps):
     approx(var1, var2)
     approx(ft1, ft2)
     approx(yt1, yt2)
+
+
+def _construct_parallel_normals(nps, var):
+    means = [B.randn(nps.dtype, 4, 6) for _ in range(3)]
+    x = Parallel(
+        *(MultiOutputNormal.diagonal(m, var + B.zeros(m), (2, 3)) for m in means)
+    )
+    return means, x
+
+
+def _forbid_sampling_elements(monkeypatch):
+    # Make sure that the joint path is taken rather than sampling every element.
+    def sample_element(*args, **kw_args):
+        raise AssertionError("Elements were sampled one by one.")
+
+    monkeypatch.setattr(MultiOutputNormal, "sample", sample_element)
+
+
+@pytest.mark.parametrize("shape", [(), (3,)])
+def test_sample_parallel_jointly(nps, shape, monkeypatch):
+    state = B.create_random_state(nps.dtype, seed=0)
+    _, x = _construct_parallel_normals(nps, 4)
+    assert can_sample_jointly(*x)
+    _forbid_sampling_elements(monkeypatch)
+
+    state, samples = sample(state, x, *shape)
+    assert len(samples) == 3
+    for s in samples:
+        assert B.shape(s) == shape + (4, 2, 3)
+
+
+def test_sample_parallel_jointly_moments(nps, monkeypatch):
+    state = B.create_random_state(nps.dtype, seed=0)
+    means, x = _construct_parallel_normals(nps, 4)
+    _forbid_sampling_elements(monkeypatch)
+
+    # Check the mean and standard deviation with many samples.
+    state, samples = sample(state, x, 10_000)
+    for m, s in zip(means, samples):
+        s = B.reshape(s, 10_000, 4, 6)
+        approx(B.mean(s, axis=0), m, atol=0.1)
+        approx(B.std(s, axis=0), 2 * B.ones(m), atol=0.1)
+
+
+def _generate_task(nps, n_context, n_target):
+    xc, yc, xt, yt = generate_data(
+        nps,
+        batch_size=2,
+        n_context=n_context,
+        n_target=n_target,
+    )
+    # Keep the context inputs within `(-1, 1)` and let the target inputs always span
+    # `[-2, 2]`. Then the discretisation is the same for every task, which means that
+    # batching tasks should not change the result.
+    xc = B.tanh(xc)
+    xt = B.concat(
+        -2 * B.ones(xt[..., :1]),
+        2 * B.ones(xt[..., :1]),
+        B.tanh(xt[..., 2:]),
+        axis=-1,
+    )
+    return xc, yc, xt, yt
+
+
+@pytest.mark.parametrize("constructor", ["construct_gnp", "construct_convgnp"])
+@pytest.mark.parametrize("n_contexts", [(5, 5), (5, 3)])
+@pytest.mark.parametrize("n_targets", [(7, 7), (7, 5)])
+def test_loglik_batched(nps, constructor, n_contexts, n_targets):
+    if constructor == "construct_gnp":
+        model = nps.construct_gnp(dtype=nps.dtype)
+    else:
+        model = nps.construct_convgnp(
+            points_per_unit=16,
+            unet_channels=(8, 16),
+            dtype=nps.dtype,
+        )
+    tasks = [_generate_task(nps, nc, nt) for nc, nt in zip(n_contexts, n_targets)]
+
+    if constructor == "construct_gnp" and n_contexts[0] != n_contexts[1]:
+        # The encoder of the GNP does not support masked context sets.
+        with pytest.raises(ValueError):
+            nps.loglik_batched(model, tasks)
+        return
+
+    logpdfs = nps.loglik_batched(model, tasks, normalise=True)
+    assert len(logpdfs) == len(tasks)
+    for task, logpdfs_task in zip(tasks, logpdfs):
+        approx(
+            logpdfs_task,
+            nps.loglik(model, *task, normalise=True),
+            rtol=1e-4,
+            atol=1e-4,
+        )
+
+
+def test_loglik_batched_plain_tensors(nps):
+    model = nps.construct_gnp(dtype=nps.dtype)
+    xc, yc, xt, yt = generate_data(nps)
+    with pytest.raises(TypeError):
+        nps.loglik_batched(model, [((xc,), yc, xt, yt)])
+
+
+def test_compile_model(nps):
+    if isinstance(nps.dtype, B.TFDType):
+        pytest.skip("Compilation is only supported for PyTorch.")
+    xc, yc, xt, yt = generate_data(nps)
+    model = nps.construct_gnp(dtype=nps.dtype)
+    logpdfs = nps.loglik(model, xc, yc, xt, yt)
+    nps.compile_model(model)
+    approx(nps.loglik(model, xc, yc, xt, yt), logpdfs, rtol=1e-5)
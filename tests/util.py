@@ -7,8 +7,6 @@ from numpy.testing import assert_allclose
 from plum import Dispatcher
 
 import neuralprocesses
-import tensorflow as tf
-import torch
 
 __all__ = ["approx", "nps", "generate_data", "remote_xfail", "remote_skip"]
 
@@ -40,20 +38,32 @@ def approx(
         approx(ai, bi, **kw_args)
 
 
-import neuralprocesses.tensorflow as nps_tf
-import neuralprocesses.torch as nps_torch
+def _load_tf():
+    import tensorflow as tf
 
-nps_torch.dtype = torch.float32
-nps_torch.dtype32 = torch.float32
-nps_torch.dtype64 = torch.float64
-nps_tf.dtype = tf.float32
-nps_tf.dtype32 = tf.float32
-nps_tf.dtype64 = tf.float64
+    import neuralprocesses.tensorflow as nps_tf
 
+    nps_tf.dtype = tf.float32
+    nps_tf.dtype32 = tf.float32
+    nps_tf.dtype64 = tf.float64
+    return nps_tf
 
-@pytest.fixture(params=[nps_tf, nps_torch], scope="module")
+
+def _load_torch():
+    import torch
+
+    import neuralprocesses.torch as nps_torch
+
+    nps_torch.dtype = torch.float32
+    nps_torch.dtype32 = torch.float32
+    nps_torch.dtype64 = torch.float64
+    return nps_torch
+
+
+# Only import a backend once a test actually requests it.
+@pytest.fixture(params=[_load_tf, _load_torch], ids=["tf", "torch"], scope="module")
 def nps(request):
-    return request.param
+    return request.param()
 
 
 def generate_data(
@@ -68,10 +78,13 @@ def generate_data(
 ):
     if dtype is None:
         dtype = nps.dtype
-    xc = B.randn(dtype, batch_size, dim_x, n_context)
-    yc = B.randn(dtype, batch_size, dim_y, n_context)
-    xt = B.randn(dtype, batch_size, dim_x, n_target)
-    yt = B.randn(dtype, batch_size, dim_y, n_target)
+    # Draw all data at once. For PyTorch, the outputs below are then non-contiguous
+    # views of the same buffer, so they must not be modified in place.
+    data = B.randn(dtype, batch_size, dim_x + dim_y, n_context + n_target)
+    xc = data[:, :dim_x, :n_context]
+    yc = data[:, dim_x:, :n_context]
+    xt = data[:, :dim_x, n_context:]
+    yt = data[:, dim_x:, n_context:]
     if binary:
         yc = B.cast(dtype, yc >= 0)
         yt = B.cast(dtype, yt >= 0)
@@ -530,6 +530,8 @@ def main(**kw_args):
             nps.loglik,
             num_samples=args.num_samples,
             normalise=not args.unnormalised,
+            # Select the best model in the same precision as the evaluation.
+            high_precision=True,
         )
         objectives_eval = [
             (
@@ -539,6 +541,7 @@ def main(**kw_args):
                     num_samples=args.evaluate_num_samples,
                     batch_size=args.evaluate_batch_size,
                     normalise=not args.unnormalised,
+                    high_precision=True,
                 ),
             )
         ]
@@ -554,6 +557,8 @@ def main(**kw_args):
             num_samples=args.num_samples,
             subsume_context=False,  # Lower bound the right quantity.
             normalise=not args.unnormalised,
+            # Select the best model in the same precision as the evaluation.
+            high_precision=True,
         )
         objectives_eval = [
             (
@@ -564,6 +569,7 @@ def main(**kw_args):
                     num_samples=5,
                     subsume_context=False,  # Lower bound the right quantity.
                     normalise=not args.unnormalised,
+                    high_precision=True,
                 ),
             ),
             (
@@ -573,6 +579,7 @@ def main(**kw_args):
                     num_samples=args.evaluate_num_samples,
                     batch_size=args.evaluate_batch_size,
                     normalise=not args.unnormalised,
+                    high_precision=True,
                 ),
             ),
         ]